@@ -1,14 +1,19 @@
 import os
 import traceback
+import numpy as np
 import pandas as pd
 from flask import Flask, jsonify, request
 from flask.cli import load_dotenv
 from flask_cors import CORS
 from sqlalchemy import create_engine, text, inspect
 
+from map_tiles import load_map_tiles
+from profiling import init_profiling
+
 load_dotenv()
 app = Flask(__name__)
 CORS(app)
+init_profiling(app)
 
 # Database configuration
 DB_CONFIG = {
@@ -307,6 +312,40 @@ def get_global_distribution(year, product):
         return jsonify({"error": "Failed to fetch map data"}), 500
 
 
+@app.route('/api/map/range/<product>', methods=['GET'])
+def get_global_distribution_range(product):
+    """Get precomputed country distributions of a product for a range of years."""
+    try:
+        map_tiles = load_map_tiles()
+        if map_tiles is None:
+            return jsonify({"error": "Map tiles have not been built"}), 503
+        index = map_tiles['index']
+        if product not in index['products']:
+            return jsonify({"error": "Invalid product name"}), 400
+
+        years = index['years']
+        start = request.args.get('start', years[0], type=int)
+        end = request.args.get('end', years[-1], type=int)
+        if start > end:
+            return jsonify({"error": "start must not be after end"}), 400
+
+        tiles = map_tiles['arrays'][product]
+        values = {}
+        for row, year in enumerate(years):
+            if start <= year <= end:
+                # NaN is not valid JSON, send missing values as null
+                values[str(year)] = [None if np.isnan(v) else v for v in tiles[row].tolist()]
+
+        return jsonify({
+            "product": product,
+            "entities": index['entities'],
+            "values": values
+        }), 200
+    except Exception as e:
+        app.logger.error(f"Map range error: {str(e)}")
+        return jsonify({"error": "Failed to fetch map data"}), 500
+
+
 @app.route('/api/stacked/<int:year>', methods=['GET'])
 def get_stacked_data(year):
     """Get production distribution data for a stacked chart for a given year."""
@@ -3,6 +3,9 @@ import pandas as pd
 import json
 from sqlalchemy import create_engine, text
 
+from map_tiles import write_map_tiles
+from schema import optimize_and_report, sql_dtypes
+
 # MySQL configuration
 DB_USER = "sql8772301"
 DB_PASSWORD = "x8cHUiD8rm"
@@ -38,10 +41,12 @@ def load_csv_to_table(table_name, csv_path, if_exists="replace"):
     df = pd.read_csv(csv_path)
     for col in df.select_dtypes(include=['float64']).columns:
         df[col] = df[col].round(0)
+    df = optimize_and_report(df, f"ingest {table_name}", print)
 
     db_engine = create_engine(f"{connection_string}/{DB_NAME}", echo=False)
-    df.to_sql(table_name, con=db_engine, if_exists=if_exists, index=False)
+    df.to_sql(table_name, con=db_engine, if_exists=if_exists, index=False, dtype=sql_dtypes(df))
     print(f"Loaded {csv_path} into table: {table_name}")
+    return df
 
 
 def load_json_to_table(table_name, json_path):
@@ -70,10 +75,14 @@ if __name__ == "__main__":
     # Create the database first
     create_database()
     # Now, load each CSV into its own table.
-    load_csv_to_table("processed_data", CSV_FILES["processed"])
+    processed_df = load_csv_to_table("processed_data", CSV_FILES["processed"])
     load_csv_to_table("yearly_production", CSV_FILES["yearly"])
     load_csv_to_table("decade_production", CSV_FILES["decade"])
     load_csv_to_table("food_stats", CSV_FILES["stats"])
 
     # Load JSON data into MySQL
-    load_json_to_table("top_producers", JSON_FILE)
\ No newline at end of file
+    load_json_to_table("top_producers", JSON_FILE)
+
+    # Map tiles are a local file build; run them after every table has loaded
+    tile_index = write_map_tiles(processed_df)
+    print(f"Wrote {len(tile_index['years'])} x {len(tile_index['products'])} map tiles")
\ No newline at end of file
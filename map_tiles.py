@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from schema import ENTITY_COL, YEAR_COL, PRODUCTION_SUFFIX, exact_float_dtype, is_aggregate_entity
+
+# Precomputed map payloads: index.json holds the entity/year/product index once and
+# names the build directory whose <product>.bin files hold a (years x entities)
+# little-endian float array with NaN for no data
+TILES_DIR = os.getenv('MAP_TILES_DIR', os.path.join('processed_data', 'map_tiles'))
+INDEX_FILE = 'index.json'
+BINARY_DTYPES = {'float32': '<f4', 'float64': '<f8'}
+
+
+def _tile_path(build_dir, product):
+    return os.path.join(build_dir, f"{product}.bin")
+
+
+def write_map_tiles(df, tiles_dir=TILES_DIR, entity_col=ENTITY_COL, year_col=YEAR_COL):
+    """
+    Write the per-year, per-product country distributions used by the map view.
+
+    The arrays go into a fresh build directory and index.json is swapped in last
+    with os.replace, so readers always see a complete index/array pair.
+    """
+    os.makedirs(tiles_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix='build_', dir=tiles_dir)
+    os.chmod(build_dir, 0o755)
+
+    entity_names = df[entity_col].astype(str)
+    countries = df[~entity_names.map(is_aggregate_entity)].assign(**{entity_col: entity_names})
+    entities = sorted(countries[entity_col].unique())
+    years = sorted(int(y) for y in countries[year_col].unique())
+    products = [col for col in df.columns if str(col).endswith(PRODUCTION_SUFFIX)]
+
+    grid = countries.groupby([year_col, entity_col])[products].first()
+    grid = grid.reindex(pd.MultiIndex.from_product([years, entities], names=[year_col, entity_col]))
+
+    dtypes = {}
+    for product in products:
+        values = grid[product].to_numpy(dtype='float64', na_value=np.nan).reshape(len(years), len(entities))
+        dtypes[product] = exact_float_dtype(values)
+        values.astype(BINARY_DTYPES[dtypes[product]]).tofile(_tile_path(build_dir, product))
+
+    index = {
+        'build': os.path.basename(build_dir),
+        'entities': entities,
+        'years': years,
+        'products': products,
+        'dtypes': dtypes,
+    }
+    index_tmp = os.path.join(build_dir, INDEX_FILE)
+    with open(index_tmp, 'w') as f:
+        json.dump(index, f)
+    os.replace(index_tmp, os.path.join(tiles_dir, INDEX_FILE))
+
+    # Drop the builds the new index no longer points at
+    for name in os.listdir(tiles_dir):
+        if name.startswith('build_') and name != index['build']:
+            shutil.rmtree(os.path.join(tiles_dir, name), ignore_errors=True)
+    return index
+
+
+@lru_cache(maxsize=2)
+def _read_tiles(tiles_dir, index_mtime_ns):
+    """Read the index and every product array together, keyed on the index mtime."""
+    with open(os.path.join(tiles_dir, INDEX_FILE)) as f:
+        index = json.load(f)
+    build_dir = os.path.join(tiles_dir, index['build'])
+    shape = (len(index['years']), len(index['entities']))
+    arrays = {
+        product: np.fromfile(_tile_path(build_dir, product), dtype=BINARY_DTYPES[dtype]).reshape(shape)
+        for product, dtype in index['dtypes'].items()
+    }
+    return {'index': index, 'arrays': arrays}
+
+
+def load_map_tiles(tiles_dir=TILES_DIR):
+    """
+    Return {'index': ..., 'arrays': {product: (years x entities) array}}, or None
+    when the tiles have not been built yet. A rebuild changes the index mtime,
+    so the next call reads the new index and arrays together.
+    """
+    path = os.path.join(tiles_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    try:
+        return _read_tiles(tiles_dir, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        # A rebuild pruned the build we were reading; the new index is in place now
+        return _read_tiles(tiles_dir, os.stat(path).st_mtime_ns)
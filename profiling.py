@@ -0,0 +1,163 @@
+import cProfile
+import hmac
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime
+
+from flask import Blueprint, abort, current_app, g, jsonify, request, send_from_directory
+
+
+def _env_number(name, default, cast, minimum):
+    """Read a numeric env var, falling back to default when it does not parse."""
+    try:
+        value = cast(os.getenv(name, default))
+    except ValueError:
+        value = default
+    return max(value, minimum)
+
+
+# Profiling configuration (opt-in, disabled unless PROFILE_ENABLED is set)
+PROFILE_CONFIG = {
+    'enabled': os.getenv('PROFILE_ENABLED', '').lower() in ('1', 'true', 'yes'),
+    'dir': os.getenv('PROFILE_DIR', 'profiles'),
+    'sample_rate': _env_number('PROFILE_SAMPLE_RATE', 0.0, float, 0.0),
+    'header': os.getenv('PROFILE_HEADER', 'X-Profile'),
+    'token': os.getenv('PROFILE_TOKEN', ''),
+    'max_files': _env_number('PROFILE_MAX_FILES', 200, int, 1),
+}
+
+profiles_bp = Blueprint('profiles', __name__)
+
+
+def _has_valid_token():
+    """Return True when the profile header carries the shared PROFILE_TOKEN."""
+    token = PROFILE_CONFIG['token']
+    supplied = request.headers.get(PROFILE_CONFIG['header'], '')
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def _should_profile():
+    """Profile when the request asks for it via header or falls into the sample."""
+    if request.blueprint == profiles_bp.name:
+        return False
+    if _has_valid_token():
+        return True
+    return random.random() < PROFILE_CONFIG['sample_rate']
+
+
+def _start_profile():
+    if not _should_profile():
+        return
+    g.profiler = cProfile.Profile()
+    g.profile_started = time.perf_counter()
+    g.profiler.enable()
+
+
+def _record_status(response):
+    if 'profiler' in g:
+        g.profile_status = response.status_code
+    return response
+
+
+def _stop_profile(exc=None):
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return
+    profiler.disable()
+    duration_ms = (time.perf_counter() - g.pop('profile_started')) * 1000
+    route = request.url_rule.rule if request.url_rule else request.path
+    try:
+        _save_profile(profiler, {
+            'route': route,
+            'path': request.path,
+            'method': request.method,
+            'status': g.pop('profile_status', 500),
+            'duration_ms': round(duration_ms, 2),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        })
+    except Exception as e:
+        current_app.logger.error(f"Failed to save profile for {route}: {str(e)}")
+
+
+def _save_profile(profiler, meta):
+    """Write the pstats dump and its metadata, then prune the oldest profiles."""
+    profile_dir = PROFILE_CONFIG['dir']
+    os.makedirs(profile_dir, exist_ok=True)
+
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', meta['route']).strip('_') or 'root'
+    name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{os.getpid()}_{slug}"
+    meta['file'] = f"{name}.prof"
+
+    profiler.dump_stats(os.path.join(profile_dir, meta['file']))
+    with open(os.path.join(profile_dir, f"{name}.json"), 'w') as f:
+        json.dump(meta, f)
+    current_app.logger.info(f"Profiled {meta['method']} {meta['path']} in {meta['duration_ms']} ms")
+
+    metas = sorted(f for f in os.listdir(profile_dir) if f.endswith('.json'))
+    for old in metas[:-PROFILE_CONFIG['max_files']]:
+        base = os.path.join(profile_dir, old[:-len('.json')])
+        for path in (f"{base}.json", f"{base}.prof"):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _load_profiles():
+    profile_dir = PROFILE_CONFIG['dir']
+    if not os.path.isdir(profile_dir):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(profile_dir), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(profile_dir, name)) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+@profiles_bp.before_request
+def _require_token():
+    if not _has_valid_token():
+        return jsonify({"error": "Invalid or missing profile token"}), 403
+
+
+@profiles_bp.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """List recent profiles, newest first, optionally filtered by route and sorted by duration."""
+    route = request.args.get('route')
+    limit = max(request.args.get('limit', 50, type=int), 0)
+    profiles = _load_profiles()
+    if route:
+        profiles = [p for p in profiles if p['route'] == route or p['path'] == route]
+    if request.args.get('sort') == 'duration':
+        profiles.sort(key=lambda p: p['duration_ms'], reverse=True)
+    return jsonify(profiles[:limit]), 200
+
+
+@profiles_bp.route('/api/profiles/<filename>', methods=['GET'])
+def download_profile(filename):
+    """Download a pstats file, e.g. for snakeviz or flameprof."""
+    if not filename.endswith('.prof'):
+        abort(404)
+    return send_from_directory(os.path.abspath(PROFILE_CONFIG['dir']), filename, as_attachment=True)
+
+
+def init_profiling(app):
+    """
+    Register the request profiler and the profile listing endpoints when enabled.
+
+    Forcing a profile and reading /api/profiles both require the profile header
+    to carry PROFILE_TOKEN; without a token only sampling is active.
+    """
+    if not PROFILE_CONFIG['enabled']:
+        return
+    app.before_request(_start_profile)
+    app.after_request(_record_status)
+    app.teardown_request(_stop_profile)
+    app.register_blueprint(profiles_bp)
+    app.logger.info(f"Request profiling enabled, writing to {PROFILE_CONFIG['dir']}")
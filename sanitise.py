@@ -6,6 +6,8 @@ from datetime import datetime
 import json
 import re
 
+from schema import memory_usage_mb, optimize_and_report
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +29,7 @@ def clean_and_process_data(input_file="world food production.csv", output_dir="p
         try:
             df = pd.read_csv(input_file)
             logger.info(f"Successfully loaded data with shape: {df.shape}")
+            logger.info(f"[load] memory {memory_usage_mb(df):.2f} MB")
         except Exception as e:
             logger.error(f"Error loading data: {e}")
             return None
@@ -118,6 +121,10 @@ def clean_and_process_data(input_file="world food production.csv", output_dir="p
                 json.dump(top_producers, f, indent=4)
             logger.info(f"Saved top producers to {top_file}")
 
+        # Downcast the frame handed back to callers only after the exports and
+        # aggregations above ran on the exact float64 values
+        df = optimize_and_report(df, "sanitise", logger.info)
+
         # Preservation stats
         preservation_stats = {
             'original_rows': initial_count,
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy.types import BigInteger, Float
+
+# Shared column layout of the processed food production data
+ENTITY_COL = 'Entity'
+YEAR_COL = 'Year'
+PRODUCTION_SUFFIX = '_Production'
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+# Regional, income-group and FAO aggregate rows mixed in with the countries
+AGGREGATE_ENTITIES = {
+    'World', 'Africa', 'Asia', 'Europe', 'North America', 'South America', 'Oceania',
+    'Melanesia', 'European Union (27)', 'High-income countries', 'Low-income countries',
+    'Lower-middle-income countries', 'Upper-middle-income countries',
+}
+
+
+def memory_usage_mb(df):
+    """Return the deep in-memory size of a DataFrame in megabytes."""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def _is_production_column(col):
+    return str(col).endswith(PRODUCTION_SUFFIX)
+
+
+def is_aggregate_entity(entity):
+    """Return True for continent, income-group and FAO region rows."""
+    return entity in AGGREGATE_ENTITIES or str(entity).endswith('(FAO)')
+
+
+def exact_float_dtype(values):
+    """Return 'float32' when a float64 array survives the float32 round trip, else 'float64'."""
+    values = np.asarray(values, dtype='float64')
+    if np.array_equal(values.astype('float32').astype('float64'), values, equal_nan=True):
+        return 'float32'
+    return 'float64'
+
+
+def _downcast_production(series, nullable=True):
+    """Return the narrowest dtype that holds every value of a production column exactly."""
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    present = values[~np.isnan(values)]
+    integral = bool(np.all(np.mod(present, 1) == 0))
+    fits_int32 = present.size == 0 or (present.min() >= INT32_MIN and present.max() <= INT32_MAX)
+    has_nulls = present.size < values.size
+
+    if integral and fits_int32 and not has_nulls:
+        return series.astype('int32')
+
+    if exact_float_dtype(values) == 'float32':
+        return series.astype('float32')
+
+    if integral and fits_int32 and nullable:
+        return series.astype('Int32')
+
+    return series.astype('float64')
+
+
+def optimize_dtypes(df, nullable=True):
+    """
+    Downcast the processed data columns to memory-efficient dtypes.
+
+    Entity becomes categorical, Year becomes int16 and every *_Production column
+    is narrowed to int32, float32 or nullable Int32 - only when the values survive
+    the conversion unchanged. Pass nullable=False when the frame is serialised
+    to JSON, which cannot encode pd.NA.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col == ENTITY_COL:
+            df[col] = series.astype('category')
+        elif col == YEAR_COL:
+            if (pd.api.types.is_integer_dtype(series) and not series.isna().any()
+                    and series.between(INT16_MIN, INT16_MAX).all()):
+                df[col] = series.astype('int16')
+        elif _is_production_column(col):
+            df[col] = _downcast_production(series, nullable=nullable)
+    return df
+
+
+def sql_dtypes(df):
+    """
+    Return a to_sql dtype mapping that keeps the original MySQL column types
+    (BIGINT Year, DOUBLE production columns) for a downcast frame.
+    """
+    dtypes = {}
+    for col in df.columns:
+        if col == YEAR_COL:
+            dtypes[col] = BigInteger()
+        elif _is_production_column(col):
+            dtypes[col] = Float(precision=53)
+    return dtypes
+
+
+def optimize_and_report(df, stage, report, optimize=optimize_dtypes):
+    """Downcast df with optimize and pass a before/after memory summary for stage to report."""
+    before = memory_usage_mb(df)
+    df = optimize(df)
+    after = memory_usage_mb(df)
+    ratio = before / after if after else 1.0
+    report(f"[{stage}] memory {before:.2f} MB -> {after:.2f} MB ({ratio:.1f}x smaller)")
+    return df